@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect, useCallback } from "react"
+import { useState, useEffect, useCallback, useRef } from "react"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
@@ -55,6 +55,7 @@ interface ExchangeStatus {
 
 interface ApiMetadata {
   total_opportunities: number
+  seq?: number
   timestamp: number
   connected_exchanges: string[]
   detection_stats: {
@@ -189,6 +190,33 @@ const mockMetadata: ApiMetadata = {
   },
 }
 
+interface OpportunityPatchOp {
+  op: "add" | "remove" | "replace"
+  id: string
+  value?: ArbitrageOpportunity
+  fields?: Partial<ArbitrageOpportunity>
+}
+
+// Apply an "arbitrage_patch" message to the current opportunity list; returns null when
+// the patch doesn't fit it (a replace for an unknown id), meaning the list has drifted
+function applyOpportunityPatch(current: ArbitrageOpportunity[], ops: OpportunityPatchOp[]) {
+  const byId = new Map(current.map((opp) => [opp.id, opp]))
+
+  for (const op of ops) {
+    if (op.op === "remove") {
+      byId.delete(op.id)
+    } else if (op.op === "add" && op.value) {
+      byId.set(op.id, op.value)
+    } else if (op.op === "replace") {
+      const previous = byId.get(op.id)
+      if (!previous) return null
+      byId.set(op.id, { ...previous, ...op.fields })
+    }
+  }
+
+  return Array.from(byId.values()).sort((a, b) => b.profitPotential - a.profitPotential)
+}
+
 export default function ProfessionalDashboard() {
   const [opportunities, setOpportunities] = useState<ArbitrageOpportunity[]>([])
   const [exchangeStatuses, setExchangeStatuses] = useState<Record<string, ExchangeStatus>>({})
@@ -199,6 +227,26 @@ export default function ProfessionalDashboard() {
   const [error, setError] = useState<string | null>(null)
   const [isPreviewMode, setIsPreviewMode] = useState(false)
   const [selectedTab, setSelectedTab] = useState("opportunities")
+  // Server detection cycle the opportunity list corresponds to, and the list itself,
+  // so patches can be checked against the base they were computed from
+  const seqRef = useRef<number | null>(null)
+  const opportunitiesRef = useRef<ArbitrageOpportunity[]>([])
+
+  // WebSocket snapshots are always adopted: seq restarts from 0 when the backend does
+  const applySnapshot = useCallback((list: ArbitrageOpportunity[], seq?: number) => {
+    seqRef.current = seq ?? null
+    opportunitiesRef.current = list
+    setOpportunities(list)
+  }, [])
+
+  const applyRestSnapshot = useCallback(
+    (list: ArbitrageOpportunity[], seq?: number) => {
+      // A REST response can be older than what the WebSocket already delivered
+      if (seq !== undefined && seqRef.current !== null && seq < seqRef.current) return
+      applySnapshot(list, seq)
+    },
+    [applySnapshot],
+  )
 
   // Check if we're in preview mode
   useEffect(() => {
@@ -218,16 +266,30 @@ export default function ProfessionalDashboard() {
   }, [])
 
   // WebSocket connection for real-time updates
-  const { status: wsStatus } = useWebSocket(isPreviewMode ? null : "ws://localhost:8000/ws", {
-    onMessage: (event) => {
+  const { status: wsStatus, send: wsSend } = useWebSocket(isPreviewMode ? null : "ws://localhost:8000/ws", {
+    onMessage: (_event, data) => {
       try {
-        const data = JSON.parse(event.data)
-
         switch (data.type) {
           case "arbitrage_update":
-            setOpportunities(data.data.opportunities)
+            applySnapshot(data.data.opportunities, data.data.seq)
             setLastUpdated(data.data.timestamp * 1000)
             break
+          case "arbitrage_patch": {
+            const next =
+              seqRef.current === data.data.base_seq
+                ? applyOpportunityPatch(opportunitiesRef.current, data.data.ops)
+                : null
+            if (next) {
+              applySnapshot(next, data.data.seq)
+              setLastUpdated(data.data.timestamp * 1000)
+            } else if (seqRef.current !== null) {
+              // Missed a cycle or patched a stale list: ask the server for the full list once,
+              // ignoring further patches until its initial_data arrives
+              seqRef.current = null
+              wsSend(JSON.stringify({ type: "resync" }))
+            }
+            break
+          }
           case "health_update":
             setExchangeStatuses(data.data.exchange_statuses)
             break
@@ -236,7 +298,7 @@ export default function ProfessionalDashboard() {
             console.log("Alert triggered:", data.data.alerts)
             break
           case "initial_data":
-            setOpportunities(data.data.opportunities)
+            applySnapshot(data.data.opportunities, data.data.seq)
             setLastUpdated(data.data.timestamp * 1000)
             break
         }
@@ -260,7 +322,7 @@ export default function ProfessionalDashboard() {
         const arbResponse = await fetch("http://localhost:8000/arbitrage")
         if (arbResponse.ok) {
           const arbData = await arbResponse.json()
-          setOpportunities(arbData.opportunities)
+          applyRestSnapshot(arbData.opportunities, arbData.metadata?.seq)
           setMetadata(arbData.metadata)
         }
 
@@ -294,7 +356,7 @@ export default function ProfessionalDashboard() {
     }
 
     fetchInitialData()
-  }, [isPreviewMode])
+  }, [isPreviewMode, applyRestSnapshot])
 
   const handleRefresh = useCallback(async () => {
     if (isPreviewMode) {
@@ -325,7 +387,7 @@ export default function ProfessionalDashboard() {
       const response = await fetch("http://localhost:8000/arbitrage")
       if (response.ok) {
         const data = await response.json()
-        setOpportunities(data.opportunities)
+        applyRestSnapshot(data.opportunities, data.metadata?.seq)
         setMetadata(data.metadata)
         setLastUpdated(Date.now())
       }
@@ -334,7 +396,7 @@ export default function ProfessionalDashboard() {
     } finally {
       setIsLoading(false)
     }
-  }, [isPreviewMode])
+  }, [isPreviewMode, applyRestSnapshot])
 
   const isConnected = !isPreviewMode && wsStatus === "open"
   const connectedExchanges = Object.values(exchangeStatuses).filter((e) => e.connected)
@@ -4,9 +4,12 @@ import { useState, useEffect, useRef, useCallback } from "react"
 
 type WebSocketStatus = "connecting" | "open" | "closed" | "error"
 
+// The backend sends JSON as binary frames, so decode them before parsing
+const textDecoder = new TextDecoder()
+
 interface UseWebSocketOptions {
   onOpen?: (event: WebSocketEventMap["open"]) => void
-  onMessage?: (event: WebSocketEventMap["message"]) => void
+  onMessage?: (event: WebSocketEventMap["message"], data: any) => void
   onClose?: (event: WebSocketEventMap["close"]) => void
   onError?: (event: WebSocketEventMap["error"]) => void
   reconnectInterval?: number
@@ -36,6 +39,7 @@ export function useWebSocket(url: string, options: UseWebSocketOptions = {}) {
 
     try {
       const ws = new WebSocket(url)
+      ws.binaryType = "arraybuffer"
       wsRef.current = ws
 
       ws.onopen = (event) => {
@@ -46,9 +50,10 @@ export function useWebSocket(url: string, options: UseWebSocketOptions = {}) {
 
       ws.onmessage = (event) => {
         try {
-          const parsed = JSON.parse(event.data)
+          const text = typeof event.data === "string" ? event.data : textDecoder.decode(event.data)
+          const parsed = JSON.parse(text)
           setData(parsed)
-          if (onMessage) onMessage(event)
+          if (onMessage) onMessage(event, parsed)
         } catch (error) {
           console.error("Failed to parse WebSocket message:", error)
         }
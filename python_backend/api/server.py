@@ -1,26 +1,139 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 import asyncio
-import json
+import functools
+import hashlib
+import importlib.util
+import inspect
+import os
+import ssl
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import uvicorn
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import aiohttp
+import certifi
+import orjson
 
 # Import our modules
 from exchanges.exchange_manager import exchange_manager
-from arbitrage.detector import arbitrage_detector, AlertCondition
+from arbitrage.detector import arbitrage_detector, AlertCondition, ArbitrageOpportunity
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+
+# Hand records to a background thread so the event loop never blocks on stderr
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+logging.getLogger().handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize a WebSocket payload straight to UTF-8 JSON bytes"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+
+def _opportunities_json(opportunities: List[ArbitrageOpportunity]) -> bytes:
+    """JSON array of opportunities joined from their cached per-opportunity bytes"""
+    return b'[' + b','.join(opp.json_bytes() for opp in opportunities) + b']'
+
+def _splice_object(head: bytes, fields: Dict[str, Any]) -> bytes:
+    """Close a partial JSON object (head ends after its last member) with extra fields"""
+    # _dumps(fields) is '{...}'; splice its members into the open object
+    tail = _dumps(fields)
+    if len(tail) > 2:
+        return head + b',' + tail[1:]
+    return head + b'}'
+
+def _opportunities_payload(message_type: str, opportunities: List[ArbitrageOpportunity], **fields) -> bytes:
+    """Build a {type, data: {opportunities, ...}} message from cached per-opportunity bytes"""
+    head = b'{"type":' + orjson.dumps(message_type) + b',"data":{"opportunities":' + _opportunities_json(opportunities)
+    return _splice_object(head, fields) + b'}'
+
+# Serialized GET responses keyed by endpoint (and path params): (cached_at, body, etag)
+_response_cache: Dict[str, Tuple[float, bytes, str]] = {}
+# Recomputes currently running, so concurrent cache misses share a single one
+_inflight_responses: Dict[str, asyncio.Task] = {}
+# Bumped by invalidate_responses(); a recompute started under an older generation isn't cached
+_response_generation = 0
+
+def invalidate_responses():
+    """Drop cached GET responses; every cached endpoint reflects the latest detection cycle"""
+    global _response_generation
+    _response_generation += 1
+    _response_cache.clear()
+    _inflight_responses.clear()
+
+def cached(ttl: float):
+    """Serve an endpoint's pre-serialized JSON body for ttl seconds between recomputes,
+    answering a matching If-None-Match with 304 Not Modified"""
+    def decorator(func):
+        async def render(key: str, args, kwargs) -> Tuple[float, bytes, str]:
+            started = time.time()
+            generation = _response_generation
+            content = await func(*args, **kwargs)
+            if not isinstance(content, bytes):
+                content = _dumps(content)
+            entry = (started, content, f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"')
+            if generation == _response_generation:
+                _response_cache[key] = entry
+            return entry
+        
+        def forget(key: str, task: asyncio.Task):
+            # Only unregister the task if an invalidation hasn't already replaced it
+            if _inflight_responses.get(key) is task:
+                del _inflight_responses[key]
+        
+        @functools.wraps(func)
+        async def wrapper(*args, request: Optional[Request] = None, **kwargs):
+            key = func.__name__
+            if kwargs:
+                key += ":" + ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+            
+            entry = _response_cache.get(key)
+            if not entry or time.time() - entry[0] >= ttl:
+                task = _inflight_responses.get(key)
+                if task is None:
+                    task = asyncio.create_task(render(key, args, kwargs))
+                    _inflight_responses[key] = task
+                    task.add_done_callback(functools.partial(forget, key))
+                
+                # Shielded so one caller disconnecting doesn't cancel the shared fetch
+                entry = await asyncio.shield(task)
+            
+            _, content, etag = entry
+            if request is not None and request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            return Response(content=content, media_type="application/json", headers={"ETag": etag})
+        
+        # FastAPI injects the request for the conditional check; the endpoint itself never sees it
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request, default=None)
+        ])
+        return wrapper
+    return decorator
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: renders endpoint dicts with orjson instead of stdlib json"""
+    
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
 app = FastAPI(
+    default_response_class=ORJSONResponse,
     title="Professional Crypto Arbitrage API",
     version="3.0.0",
     description="Advanced real-time arbitrage detection across Kraken, KuCoin, and Bitfinex",
@@ -37,76 +150,179 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outbound messages buffered per client before it is dropped as too slow
+OUTBOUND_QUEUE_SIZE = 100
+
+@dataclass(slots=True)
+class ConnectionInfo:
+    """Per-connection bookkeeping for a WebSocket client"""
+    connected_at: float
+    queue: asyncio.Queue
+    drainer: Optional[asyncio.Task] = None
+    client_info: Dict = field(default_factory=dict)
+
 class ConnectionManager:
     """Enhanced WebSocket connection manager"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.connection_info: Dict[WebSocket, Dict] = {}
+        self.connections: Dict[WebSocket, ConnectionInfo] = {}
+        self.total_messages_sent = 0
+        # Detection cycle that clients' opportunity lists correspond to, and that cycle's
+        # opportunities; patches name the seq they apply to so a client can spot a gap
+        self.seq = 0
+        self._last_opportunities: List[ArbitrageOpportunity] = []
+        # initial_data message for newly connected clients; cleared after every detection cycle
+        self.initial_payload: Optional[bytes] = None
     
     async def connect(self, websocket: WebSocket, client_info: Dict = None):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        self.connection_info[websocket] = {
-            "connected_at": time.time(),
-            "client_info": client_info or {},
-            "messages_sent": 0
-        }
-        logger.info(f"📱 WebSocket connected. Total: {len(self.active_connections)}")
+        info = ConnectionInfo(
+            connected_at=time.time(),
+            queue=asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE),
+            client_info=client_info or {}
+        )
+        info.drainer = asyncio.create_task(self._drain(websocket, info.queue))
+        self.connections[websocket] = info
+        logger.info(f"📱 WebSocket connected. Total: {len(self.connections)}")
     
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            if websocket in self.connection_info:
-                del self.connection_info[websocket]
-            logger.info(f"📱 WebSocket disconnected. Total: {len(self.active_connections)}")
+        info = self.connections.pop(websocket, None)
+        if info is None:
+            return
+        
+        if info.drainer is not None and info.drainer is not asyncio.current_task():
+            info.drainer.cancel()
+        logger.info(f"📱 WebSocket disconnected. Total: {len(self.connections)}")
     
-    async def send_personal_message(self, message: str, websocket: WebSocket):
+    async def _drain(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send a client's queued payloads in order, at whatever pace its socket allows"""
+        while True:
+            payload = await queue.get()
+            try:
+                await websocket.send_bytes(payload)
+            except Exception:
+                self.disconnect(websocket)
+                return
+            self.total_messages_sent += 1
+    
+    def _enqueue(self, websocket: WebSocket, info: ConnectionInfo, payload: bytes):
         try:
-            await websocket.send_text(message)
-            if websocket in self.connection_info:
-                self.connection_info[websocket]["messages_sent"] += 1
-        except:
+            info.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("🐢 WebSocket client too slow, dropping connection")
             self.disconnect(websocket)
+            asyncio.create_task(self._close(websocket))
     
-    async def broadcast(self, message: str, message_type: str = "general"):
-        if not self.active_connections:
-            return
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+    
+    async def send_personal_message(self, payload: bytes, websocket: WebSocket):
+        info = self.connections.get(websocket)
+        if info is not None:
+            self._enqueue(websocket, info, payload)
+    
+    async def broadcast(self, payload: bytes, message_type: str = "general"):
+        # The payload is encoded once by the caller and queued to every client;
+        # each client's drainer does the network send, so a slow one stalls nobody
+        for websocket, info in list(self.connections.items()):
+            self._enqueue(websocket, info, payload)
         
-        dead_connections = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-                if connection in self.connection_info:
-                    self.connection_info[connection]["messages_sent"] += 1
-            except:
-                dead_connections.append(connection)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📡 Broadcasted {message_type} to {len(self.connections)} clients")
+    
+    def diff_opportunities(self, opportunities: List[ArbitrageOpportunity]) -> List[Dict]:
+        """Compute add/remove/replace ops against the last snapshot, advancing seq if any"""
+        # to_dict() is memoized, so rebuilding the previous snapshot costs no serialization
+        last_snapshot = {opp.id: opp.to_dict() for opp in self._last_opportunities}
+        snapshot = {opp.id: opp.to_dict() for opp in opportunities}
+        ops = [
+            {"op": "remove", "id": opp_id}
+            for opp_id in last_snapshot.keys() - snapshot.keys()
+        ]
         
-        for dead_conn in dead_connections:
-            self.disconnect(dead_conn)
+        for opp_id, current in snapshot.items():
+            previous = last_snapshot.get(opp_id)
+            if previous is None:
+                ops.append({"op": "add", "id": opp_id, "value": current})
+                continue
+            
+            changed = {key: value for key, value in current.items() if previous.get(key) != value}
+            # A re-detected route only gets a new timestamp and frequency each cycle; send it
+            # again only once its prices, volumes or scores have actually moved
+            if changed.keys() - _RESTAMPED_FIELDS:
+                ops.append({"op": "replace", "id": opp_id, "fields": changed})
         
-        logger.debug(f"📡 Broadcasted {message_type} to {len(self.active_connections)} clients")
+        # Restamp-only cycles keep the current seq: clients already hold an equivalent list
+        if ops:
+            self._last_opportunities = opportunities
+            self.seq += 1
+        return ops
+    
+    def record_cycle(self, opportunities: List[ArbitrageOpportunity]):
+        """Adopt a cycle's opportunities as the snapshot without diffing (nobody is listening)"""
+        self._last_opportunities = opportunities
+        self.seq += 1
+    
+    def snapshot(self) -> Tuple[int, List[ArbitrageOpportunity]]:
+        """seq and the opportunity list it describes, for anything that sends the full state"""
+        # Not the detector's current list: a failed cycle can leave that behind the snapshot
+        return self.seq, self._last_opportunities
+    
+    def get_initial_payload(self) -> bytes:
+        """initial_data message for the current seq, serialized once however many clients join"""
+        if self.initial_payload is None:
+            seq, opportunities = self.snapshot()
+            self.initial_payload = _opportunities_payload(
+                "initial_data",
+                opportunities,
+                seq=seq,
+                timestamp=time.time(),
+                connected_exchanges=exchange_manager.get_connected_exchanges()
+            )
+        return self.initial_payload
+
+# Opportunity fields that change on every detection cycle even when the market hasn't
+_RESTAMPED_FIELDS = frozenset({"timestamp", "historicalFrequency"})
 
 manager = ConnectionManager()
 
+# Shared outbound HTTP session for exchange requests, created on startup
+http_session: Optional[aiohttp.ClientSession] = None
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
     logger.info("🚀 Starting Professional Crypto Arbitrage API...")
     
-    # Initialize exchanges
-    await exchange_manager.initialize()
+    # Initialize exchanges on one keep-alive connection pool
+    global http_session
+    # ccxt only applies its certifi trust store to sessions it creates itself, so the
+    # shared connector has to carry it or TLS would fall back to the system CA bundle
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=30, ttl_dns_cache=300,
+                                     ssl=ssl_context)
+    http_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10))
+    await exchange_manager.initialize(session=http_session)
     
     # Start background services
     asyncio.create_task(arbitrage_detection_service())
     asyncio.create_task(health_monitoring_service())
+    asyncio.create_task(heartbeat_service())
     
     logger.info("✅ Application startup complete")
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """API documentation homepage"""
-    return """
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release exchange clients and the shared HTTP session"""
+    await exchange_manager.close()
+    if http_session is not None:
+        await http_session.close()
+
+# Homepage markup, encoded once at import instead of on every request
+_ROOT_HTML_BYTES = """
     <html>
         <head>
             <title>Professional Crypto Arbitrage API</title>
@@ -141,7 +357,12 @@ async def root():
             <p><em>Built for professional traders and developers</em></p>
         </body>
     </html>
-    """
+    """.encode("utf-8")
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """API documentation homepage"""
+    return Response(content=_ROOT_HTML_BYTES, media_type="text/html")
 
 @app.get("/health")
 async def health_check():
@@ -166,11 +387,13 @@ async def health_check():
             "avg_detection_time": analytics["detection_stats"]["avg_detection_time"],
             "current_opportunities": analytics["current"]["total_opportunities"]
         },
-        "websocket_connections": len(manager.active_connections),
+        "websocket_connections": len(manager.connections),
+        "websocket_messages_sent": manager.total_messages_sent,
         "uptime": time.time() - startup_time if 'startup_time' in globals() else 0
     }
 
 @app.get("/exchanges")
+@cached(ttl=5)
 async def get_exchanges():
     """Get detailed exchange information"""
     statuses = exchange_manager.get_exchange_statuses()
@@ -185,20 +408,18 @@ async def get_exchanges():
     }
 
 @app.get("/quotes")
+@cached(ttl=2)
 async def get_live_quotes():
     """Get current live quotes from all exchanges"""
     try:
-        quotes = await exchange_manager.fetch_all_quotes()
+        # The detection loop keeps the cache warm; only fetch if it has gone stale
+        if not exchange_manager.quotes_are_fresh():
+            await exchange_manager.fetch_all_quotes()
+        quotes = exchange_manager.get_quote_dicts()
         market_summary = exchange_manager.get_market_summary()
         
         return {
-            "quotes": {
-                exchange: {
-                    symbol: quote.to_dict() 
-                    for symbol, quote in symbols.items()
-                }
-                for exchange, symbols in quotes.items()
-            },
+            "quotes": quotes,
             "market_summary": market_summary,
             "timestamp": time.time(),
             "total_quotes": sum(len(symbols) for symbols in quotes.values())
@@ -236,38 +457,38 @@ async def get_specific_quote(exchange: str, symbol: str):
         raise HTTPException(status_code=500, detail=f"Error fetching quote: {str(e)}")
 
 @app.get("/arbitrage")
+@cached(ttl=2)
 async def get_arbitrage_opportunities():
     """Get current arbitrage opportunities"""
-    opportunities = list(arbitrage_detector.opportunities.values())
+    seq, opportunities = manager.snapshot()
     analytics = arbitrage_detector.get_analytics()
     
-    return {
-        "opportunities": [opp.to_dict() for opp in opportunities],
-        "metadata": {
-            "total_opportunities": len(opportunities),
-            "timestamp": time.time(),
-            "connected_exchanges": exchange_manager.get_connected_exchanges(),
-            "detection_stats": analytics["detection_stats"],
-            "current_analytics": analytics["current"]
-        }
-    }
+    # Opportunities are spliced in from their cached bytes; only metadata is encoded here
+    metadata = _dumps({
+        "total_opportunities": len(opportunities),
+        "seq": seq,
+        "timestamp": time.time(),
+        "connected_exchanges": exchange_manager.get_connected_exchanges(),
+        "detection_stats": analytics["detection_stats"],
+        "current_analytics": analytics["current"]
+    })
+    return b'{"opportunities":' + _opportunities_json(opportunities) + b',"metadata":' + metadata + b'}'
 
 @app.get("/arbitrage/{symbol}")
 async def get_arbitrage_for_symbol(symbol: str):
     """Get arbitrage opportunities for a specific symbol"""
-    opportunities = [
-        opp for opp in arbitrage_detector.opportunities.values()
-        if opp.symbol == symbol
-    ]
+    opportunities = arbitrage_detector.by_symbol.get(symbol, [])
     
-    return {
+    head = b'{"opportunities":' + _opportunities_json(opportunities)
+    content = _splice_object(head, {
         "symbol": symbol,
-        "opportunities": [opp.to_dict() for opp in opportunities],
         "count": len(opportunities),
         "timestamp": time.time()
-    }
+    })
+    return Response(content=content, media_type="application/json")
 
 @app.get("/analytics")
+@cached(ttl=5)
 async def get_analytics():
     """Get comprehensive analytics"""
     analytics = arbitrage_detector.get_analytics()
@@ -281,7 +502,7 @@ async def get_analytics():
             "market_summary": market_summary
         },
         "system_analytics": {
-            "websocket_connections": len(manager.active_connections),
+            "websocket_connections": len(manager.connections),
             "uptime": time.time() - startup_time if 'startup_time' in globals() else 0
         },
         "timestamp": time.time()
@@ -326,7 +547,7 @@ async def get_alerts():
                 "min_profit_potential": condition.min_profit_potential,
                 "min_confidence_score": condition.min_confidence_score,
                 "preferred_exchanges": condition.preferred_exchanges,
-                "max_risk_level": condition.max_risk_level,
+                "max_risk_level": condition.max_risk_level.label,
                 "enabled": condition.enabled
             }
             for alert_id, condition in arbitrage_detector.alert_conditions.items()
@@ -350,34 +571,21 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     
     try:
-        # Send initial data
-        opportunities = list(arbitrage_detector.opportunities.values())
-        if opportunities:
-            initial_message = {
-                "type": "initial_data",
-                "data": {
-                    "opportunities": [opp.to_dict() for opp in opportunities],
-                    "timestamp": time.time(),
-                    "connected_exchanges": exchange_manager.get_connected_exchanges()
-                }
-            }
-            await manager.send_personal_message(json.dumps(initial_message), websocket)
+        # Send initial data; it carries the seq the first patch will build on
+        await manager.send_personal_message(manager.get_initial_payload(), websocket)
         
-        # Keep connection alive and handle incoming messages
+        # Keep connection alive; heartbeats are broadcast by heartbeat_service
         while True:
+            # Wait for client messages (for future interactive features)
+            message = await websocket.receive_text()
+            
+            # A client that missed a patch asks for the full list again
             try:
-                # Wait for client messages (for future interactive features)
-                message = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)
-                # Handle client messages here if needed
-            except asyncio.TimeoutError:
-                # Send periodic heartbeat
-                heartbeat = {
-                    "type": "heartbeat",
-                    "timestamp": time.time(),
-                    "connections": len(manager.active_connections)
-                }
-                await manager.send_personal_message(json.dumps(heartbeat), websocket)
-                await asyncio.sleep(30)  # Wait 30 seconds before next heartbeat
+                client_message = orjson.loads(message)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(client_message, dict) and client_message.get("type") == "resync":
+                await manager.send_personal_message(manager.get_initial_payload(), websocket)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -385,6 +593,9 @@ async def websocket_endpoint(websocket: WebSocket):
 async def arbitrage_detection_service():
     """Enhanced background arbitrage detection service"""
     logger.info("🔍 Starting arbitrage detection service...")
+    # Seconds until the next cycle: shortened while opportunities keep appearing,
+    # lengthened in quiet markets and doubled while cycles keep failing
+    next_sleep = 15.0
     
     while True:
         try:
@@ -392,25 +603,51 @@ async def arbitrage_detection_service():
             
             # Detect opportunities
             opportunities = await arbitrage_detector.detect_opportunities()
+            manager.initial_payload = None
+            invalidate_responses()
             
             # Check for alerts
             triggered_alerts = arbitrage_detector.check_alerts(opportunities)
             
-            detection_time = time.time() - start_time
+            # One clock read stamps everything this cycle sends
+            now = time.time()
+            detection_time = now - start_time
             
-            # Broadcast opportunities to WebSocket clients
-            if opportunities or len(manager.active_connections) > 0:
-                message = {
-                    "type": "arbitrage_update",
-                    "data": {
-                        "opportunities": [opp.to_dict() for opp in opportunities],
-                        "timestamp": time.time(),
-                        "detection_time": detection_time,
-                        "connected_exchanges": exchange_manager.get_connected_exchanges(),
-                        "triggered_alerts": len(triggered_alerts)
-                    }
-                }
-                await manager.broadcast(json.dumps(message), "arbitrage_update")
+            # Broadcast opportunities to WebSocket clients, as a patch when it is smaller;
+            # with nobody listening skip the diff and encoding, but still advance seq so
+            # the next client's initial_data and the patches after it line up
+            if not manager.connections:
+                manager.record_cycle(opportunities)
+            else:
+                base_seq = manager.seq
+                ops = manager.diff_opportunities(opportunities)
+                if not ops and not triggered_alerts:
+                    logger.debug("😴 Opportunities unchanged, skipping broadcast")
+                elif len(ops) < len(opportunities):
+                    message = _dumps({
+                        "type": "arbitrage_patch",
+                        "data": {
+                            "ops": ops,
+                            "base_seq": base_seq,
+                            "seq": manager.seq,
+                            "timestamp": now,
+                            "detection_time": detection_time,
+                            "connected_exchanges": exchange_manager.get_connected_exchanges(),
+                            "triggered_alerts": len(triggered_alerts)
+                        }
+                    })
+                    await manager.broadcast(message, "arbitrage_patch")
+                else:
+                    message = _opportunities_payload(
+                        "arbitrage_update",
+                        opportunities,
+                        seq=manager.seq,
+                        timestamp=now,
+                        detection_time=detection_time,
+                        connected_exchanges=exchange_manager.get_connected_exchanges(),
+                        triggered_alerts=len(triggered_alerts)
+                    )
+                    await manager.broadcast(message, "arbitrage_update")
             
             # Handle triggered alerts
             if triggered_alerts:
@@ -424,24 +661,38 @@ async def arbitrage_detection_service():
                             }
                             for condition, opportunity in triggered_alerts
                         ],
-                        "timestamp": time.time()
+                        "timestamp": now
                     }
                 }
-                await manager.broadcast(json.dumps(alert_message), "alert")
+                await manager.broadcast(_dumps(alert_message), "alert")
                 logger.info(f"🚨 {len(triggered_alerts)} alerts triggered")
             
             # Log performance
-            if opportunities:
-                best_opp = max(opportunities, key=lambda x: x.profit_potential)
-                logger.info(f"🏆 Best opportunity: {best_opp.symbol} "
+            if opportunities and logger.isEnabledFor(logging.DEBUG):
+                best_opp = opportunities[0]  # detect_opportunities sorts by profit potential
+                logger.debug(f"🏆 Best opportunity: {best_opp.symbol} "
                           f"{best_opp.spread_percent:.3f}% (${best_opp.profit_potential:.2f})")
             
-            # Wait before next detection cycle
-            await asyncio.sleep(15)  # Check every 15 seconds
+            # Wait before next detection cycle; a cycle that couldn't run backs off like an error
+            if arbitrage_detector.last_detection_failed:
+                next_sleep = min(120.0, next_sleep * 2)
+            elif opportunities:
+                next_sleep = max(5.0, next_sleep * 0.7)
+            else:
+                next_sleep = min(60.0, next_sleep * 1.2)
+            await asyncio.sleep(next_sleep)
             
         except Exception as e:
-            logger.error(f"❌ Error in arbitrage detection service: {e}")
-            await asyncio.sleep(10)
+            next_sleep = min(120.0, next_sleep * 2)
+            logger.error(f"❌ Error in arbitrage detection service: {e} (retrying in {next_sleep:.0f}s)")
+            await asyncio.sleep(next_sleep)
+
+# Message shells reused by the periodic services; only their changing fields are refreshed
+_HEALTH_TEMPLATE: Dict[str, Any] = {
+    "type": "health_update",
+    "data": {"exchange_statuses": {}, "connected_exchanges": [], "timestamp": 0.0}
+}
+_HEARTBEAT_TEMPLATE: Dict[str, Any] = {"type": "heartbeat", "timestamp": 0.0, "connections": 0}
 
 async def health_monitoring_service():
     """Background health monitoring service"""
@@ -455,28 +706,51 @@ async def health_monitoring_service():
             await exchange_manager.perform_health_checks()
             
             # Send health update to WebSocket clients
-            health_data = {
-                "type": "health_update",
-                "data": {
-                    "exchange_statuses": exchange_manager.get_exchange_statuses(),
-                    "connected_exchanges": exchange_manager.get_connected_exchanges(),
-                    "timestamp": time.time()
-                }
-            }
-            await manager.broadcast(json.dumps(health_data), "health_update")
+            health_data = _HEALTH_TEMPLATE["data"]
+            health_data["exchange_statuses"] = exchange_manager.get_exchange_statuses()
+            health_data["connected_exchanges"] = exchange_manager.get_connected_exchanges()
+            health_data["timestamp"] = time.time()
+            await manager.broadcast(_dumps(_HEALTH_TEMPLATE), "health_update")
             
         except Exception as e:
             logger.error(f"❌ Error in health monitoring service: {e}")
 
+async def heartbeat_service():
+    """Broadcast one shared heartbeat to all WebSocket clients every 30 seconds"""
+    logger.info("💓 Starting heartbeat service...")
+    
+    while True:
+        try:
+            await asyncio.sleep(30)
+            
+            if not manager.connections:
+                continue
+            
+            _HEARTBEAT_TEMPLATE["timestamp"] = time.time()
+            _HEARTBEAT_TEMPLATE["connections"] = len(manager.connections)
+            await manager.broadcast(_dumps(_HEARTBEAT_TEMPLATE), "heartbeat")
+            
+        except Exception as e:
+            logger.error(f"❌ Error in heartbeat service: {e}")
+
 # Global startup time tracking
 startup_time = time.time()
 
 if __name__ == "__main__":
     logger.info("🚀 Starting Professional Crypto Arbitrage API server...")
+    
+    # Each worker runs its own detection service against the exchanges and
+    # keeps its own opportunities, alert conditions and WebSocket clients,
+    # so only raise API_WORKERS when the extra exchange traffic is acceptable
+    # and alerts are created against every worker (or with sticky sessions)
+    workers = int(os.environ.get("API_WORKERS", "1"))
     uvicorn.run(
-        app, 
-        host="0.0.0.0", 
-        port=8000, 
-        log_level="info",
-        access_log=True
+        "api.server:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools",
+        workers=workers,
+        log_level="warning",
+        access_log=False
     )
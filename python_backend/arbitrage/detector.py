@@ -1,15 +1,64 @@
 import asyncio
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from collections import Counter, deque
 from dataclasses import dataclass, field
-import statistics
-from exchanges.base_exchange import Quote
+from enum import IntEnum
+from bisect import bisect_left, bisect_right
+import heapq
+from operator import itemgetter
+import numpy as np
+import orjson
 from exchanges.exchange_manager import exchange_manager
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Scoring tables shared by every ArbitrageOpportunity, keyed by base asset or exchange
+_RELIABLE_EXCHANGES = frozenset({'kraken'})
+_GOOD_EXCHANGES = frozenset({'kucoin', 'bitfinex'})
+# Indexed by how many sides of the trade are on a reliable exchange
+_RELIABILITY_FACTORS = (0.0, 0.10, 0.15)
+_VOLUME_DIVISORS = {'BTC': 2.0, 'ETH': 10.0}
+_VOLUME_LIMITS = {
+    'BTC': 0.5, 'ETH': 5.0, 'XRP': 1000.0, 'LTC': 10.0,
+    'ADA': 1000.0, 'DOT': 100.0, 'LINK': 100.0, 'UNI': 100.0
+}
+_LIQUID_BASES = frozenset({'BTC', 'ETH'})
+
+def _none_if_nan(value: float) -> Optional[float]:
+    """Quote-matrix cell back to the Optional[float] the opportunity fields use"""
+    return None if value != value else float(value)
+
+class RiskLevel(IntEnum):
+    """Opportunity risk tiers, ordered so they compare as plain integers"""
+    LOW = 0
+    MEDIUM_LOW = 1
+    MEDIUM = 2
+    MEDIUM_HIGH = 3
+    HIGH = 4
+    
+    @property
+    def label(self) -> str:
+        """API form of the level, e.g. 'medium-high'"""
+        return _RISK_LABELS[self]
+    
+    @classmethod
+    def parse(cls, value) -> "RiskLevel":
+        """Accept a RiskLevel or its API label"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(_RISK_LABELS.index(value))
+        except ValueError:
+            raise ValueError(f"Unknown risk level: {value}") from None
+
+_RISK_LABELS = ("low", "medium-low", "medium", "medium-high", "high")
+# A spread above _RISK_THRESHOLDS[i] moves the opportunity past RiskLevel(i)
+_RISK_THRESHOLDS = (0.1, 0.2, 0.5, 1.0)
+_RISK_LEVELS = tuple(RiskLevel)
+
+@dataclass(slots=True)
 class ArbitrageOpportunity:
     """Enhanced arbitrage opportunity with analytics"""
     id: str
@@ -26,87 +75,89 @@ class ArbitrageOpportunity:
     confidence_score: float = 0.0
     profit_potential: float = 0.0
     execution_time_estimate: float = 0.0
-    risk_level: str = "medium"
+    risk_level: RiskLevel = RiskLevel.MEDIUM
     historical_frequency: float = 0.0
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    _json_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        self.confidence_score = self._calculate_confidence()
-        self.profit_potential = self._calculate_profit_potential()
-        self.execution_time_estimate = self._estimate_execution_time()
+        base = self.symbol.partition('/')[0]
+        self.confidence_score = self._calculate_confidence(base)
+        self.profit_potential = self._calculate_profit_potential(base)
+        self.execution_time_estimate = self._estimate_execution_time(base)
         self.risk_level = self._assess_risk_level()
     
-    def _calculate_confidence(self) -> float:
+    def _calculate_confidence(self, base: str) -> float:
         """Calculate confidence score (0-1) based on multiple factors"""
         base_confidence = 0.4
         
         spread_factor = min(self.spread_percent / 3.0, 0.25)
         
         volume_factor = 0.0
-        if self.buy_volume and self.sell_volume:
-            min_volume = min(self.buy_volume, self.sell_volume)
-            if 'BTC' in self.symbol:
-                volume_factor = min(min_volume / 2.0, 0.15)
-            elif 'ETH' in self.symbol:
-                volume_factor = min(min_volume / 10.0, 0.15)
-            else:
-                volume_factor = min(min_volume / 100.0, 0.15)
-        
-        reliable_exchanges = {'kraken'}
-        good_exchanges = {'kucoin', 'bitfinex'}
-        
-        reliability_factor = 0.0
-        if self.buy_exchange in reliable_exchanges and self.sell_exchange in reliable_exchanges:
-            reliability_factor = 0.15
-        elif (self.buy_exchange in reliable_exchanges or self.sell_exchange in reliable_exchanges):
-            reliability_factor = 0.10
-        elif (self.buy_exchange in good_exchanges and self.sell_exchange in good_exchanges):
+        buy_volume, sell_volume = self.buy_volume, self.sell_volume
+        if buy_volume and sell_volume:
+            min_volume = min(buy_volume, sell_volume)
+            volume_factor = min(min_volume / _VOLUME_DIVISORS.get(base, 100.0), 0.15)
+        
+        buy_exchange, sell_exchange = self.buy_exchange, self.sell_exchange
+        reliable = (buy_exchange in _RELIABLE_EXCHANGES) + (sell_exchange in _RELIABLE_EXCHANGES)
+        if reliable:
+            reliability_factor = _RELIABILITY_FACTORS[reliable]
+        elif buy_exchange in _GOOD_EXCHANGES and sell_exchange in _GOOD_EXCHANGES:
             reliability_factor = 0.05
+        else:
+            reliability_factor = 0.0
         
         return min(1.0, base_confidence + spread_factor + volume_factor + reliability_factor)
     
-    def _calculate_profit_potential(self) -> float:
+    def _calculate_profit_potential(self, base: str) -> float:
         """Calculate potential profit in USD"""
         if not self.buy_volume or not self.sell_volume:
             return 0.0
         
-        volume_limits = {
-            'BTC': 0.5, 'ETH': 5.0, 'XRP': 1000.0, 'LTC': 10.0,
-            'ADA': 1000.0, 'DOT': 100.0, 'LINK': 100.0, 'UNI': 100.0
-        }
-        
-        symbol_base = self.symbol.split('/')[0]
-        max_volume = volume_limits.get(symbol_base, 100.0)
+        max_volume = _VOLUME_LIMITS.get(base, 100.0)
         
         tradeable_volume = min(self.buy_volume, self.sell_volume, max_volume)
         effective_spread = self.spread * 0.9  # Account for slippage
         
         return effective_spread * tradeable_volume
     
-    def _estimate_execution_time(self) -> float:
+    def _estimate_execution_time(self, base: str) -> float:
         """Estimate time window for execution in seconds"""
         base_time = 30.0
         spread_factor = max(0.5, 2.0 - (self.spread_percent / 0.5))
         
-        liquidity_factor = 1.0
-        if 'BTC' in self.symbol or 'ETH' in self.symbol:
-            liquidity_factor = 0.7
+        liquidity_factor = 0.7 if base in _LIQUID_BASES else 1.0
         
         return base_time * spread_factor * liquidity_factor
     
-    def _assess_risk_level(self) -> str:
+    def _assess_risk_level(self) -> RiskLevel:
         """Assess risk level based on various factors"""
-        if self.spread_percent > 1.0:
-            return "high"
-        elif self.spread_percent > 0.5:
-            return "medium-high"
-        elif self.spread_percent > 0.2:
-            return "medium"
-        elif self.spread_percent > 0.1:
-            return "medium-low"
-        else:
-            return "low"
+        return _RISK_LEVELS[bisect_left(_RISK_THRESHOLDS, self.spread_percent)]
+    
+    @property
+    def route(self) -> Tuple[str, str, str]:
+        """(symbol, buy_exchange, sell_exchange): the natural key behind id"""
+        return (self.symbol, self.buy_exchange, self.sell_exchange)
     
     def to_dict(self) -> Dict:
+        """Serialized form, built once and reused by every API/WebSocket consumer"""
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def json_bytes(self) -> bytes:
+        """orjson-encoded form of to_dict(), cached alongside it"""
+        if self._json_cache is None:
+            self._json_cache = orjson.dumps(self.to_dict())
+        return self._json_cache
+    
+    def invalidate_cache(self):
+        """Drop cached serializations after a field has been updated"""
+        self._dict_cache = None
+        self._json_cache = None
+    
+    def _build_dict(self) -> Dict:
         return {
             "id": self.id,
             "symbol": self.symbol,
@@ -122,11 +173,11 @@ class ArbitrageOpportunity:
             "confidenceScore": self.confidence_score,
             "profitPotential": self.profit_potential,
             "executionTimeEstimate": self.execution_time_estimate,
-            "riskLevel": self.risk_level,
+            "riskLevel": self.risk_level.label,
             "historicalFrequency": self.historical_frequency
         }
 
-@dataclass
+@dataclass(slots=True)
 class AlertCondition:
     """User-defined alert condition"""
     id: str
@@ -136,9 +187,12 @@ class AlertCondition:
     min_profit_potential: float = 0.0
     min_confidence_score: float = 0.5
     preferred_exchanges: List[str] = field(default_factory=list)
-    max_risk_level: str = "medium-high"
+    max_risk_level: RiskLevel = RiskLevel.MEDIUM_HIGH
     enabled: bool = True
     
+    def __post_init__(self):
+        self.max_risk_level = RiskLevel.parse(self.max_risk_level)
+    
     def matches(self, opportunity: ArbitrageOpportunity) -> bool:
         """Check if opportunity matches this alert condition"""
         if not self.enabled:
@@ -161,216 +215,367 @@ class AlertCondition:
                 opportunity.sell_exchange not in self.preferred_exchanges):
                 return False
         
-        risk_levels = ["low", "medium-low", "medium", "medium-high", "high"]
-        if risk_levels.index(opportunity.risk_level) > risk_levels.index(self.max_risk_level):
+        if opportunity.risk_level > self.max_risk_level:
             return False
         
         return True
 
+class HistoryEntry(NamedTuple):
+    """What the 24h history keeps of an opportunity: its route, spread and detection time"""
+    route: Tuple[str, str, str]
+    spread_percent: float
+    timestamp: float
+
 class ArbitrageDetector:
     """Advanced arbitrage detector with analytics and alerts"""
     
-    def __init__(self, min_spread_percent: float = 0.05):
+    def __init__(self, min_spread_percent: float = 0.05, max_opportunities: int = 100):
         self.min_spread_percent = min_spread_percent
-        self.opportunities: Dict[str, ArbitrageOpportunity] = {}
-        self.historical_opportunities: List[ArbitrageOpportunity] = []
+        # Only the most profitable candidates per cycle are scored and kept
+        self.max_opportunities = max_opportunities
+        self.opportunities: Dict[Tuple[str, str, str], ArbitrageOpportunity] = {}
+        self.by_symbol: Dict[str, List[ArbitrageOpportunity]] = {}
+        # Oldest first; detection cycles append with non-decreasing timestamps
+        self.historical_opportunities: Deque[HistoryEntry] = deque()
+        # Running count of historical opportunities per (symbol, buy, sell) route
+        self._historical_counts: Counter = Counter()
+        # Running spread sum over the history, and a monotonic deque whose head is its max spread
+        self._historical_spread_sum = 0.0
+        self._historical_max: Deque[HistoryEntry] = deque()
+        # Aggregates over self.opportunities, computed once per detection cycle
+        self._current_summary = self._summarize(())
         self.alert_conditions: Dict[str, AlertCondition] = {}
+        # Alert conditions by symbol (None = any symbol), sorted by min_spread_percent,
+        # paired with their thresholds so check_alerts can bisect past unreachable ones
+        self._alert_index: Dict[Optional[str], Tuple[List[AlertCondition], List[float]]] = {}
         self.last_detection_time = 0
+        # Whether the last detect_opportunities() call gave up (too few exchanges or an error)
+        # rather than genuinely finding nothing; both return an empty list
+        self.last_detection_failed = False
         self.detection_stats = {
             "total_detections": 0,
             "opportunities_found": 0,
-            "avg_detection_time": 0.0,
-            "detection_times": []
+            "avg_detection_time": 0.0
         }
+        # Last 100 detection durations and their running sum, for the rolling average
+        self._detection_times: Deque[float] = deque(maxlen=100)
+        self._detection_time_sum = 0.0
+        # Scan candidates per symbol, reused while that symbol's quotes are unchanged
+        self._symbol_candidates: Dict[str, List[Tuple]] = {}
+        # Ask/bid/volume cells and (symbols, exchanges, threshold) the cache was built from
+        self._last_cells: Optional[np.ndarray] = None
+        self._last_layout: Optional[Tuple] = None
     
     async def detect_opportunities(self) -> List[ArbitrageOpportunity]:
         """Detect arbitrage opportunities with enhanced analytics"""
         start_time = time.time()
         opportunities = []
+        self.last_detection_failed = True
         
         try:
             all_quotes = await exchange_manager.fetch_all_quotes()
+            # One timestamp for everything this cycle produces, taken once quotes are in
+            now = time.time()
             
             if len(all_quotes) < 2:
                 logger.warning("Need at least 2 exchanges for arbitrage detection")
                 return opportunities
             
-            for symbol in exchange_manager.get_supported_symbols():
-                symbol_opportunities = self._analyze_symbol(symbol, all_quotes)
-                opportunities.extend(symbol_opportunities)
+            symbols = exchange_manager.get_supported_symbols()
+            exchanges = exchange_manager.exchange_names
+            book = exchange_manager.get_quote_matrix()
+            with np.errstate(invalid='ignore'):
+                asks = np.where(book['ask'] > 0, book['ask'], np.nan)
+                bids = np.where(book['bid'] > 0, book['bid'], np.nan)
+            
+            # Best bid anywhere vs best ask anywhere bounds every pair's spread,
+            # so only symbols that clear the threshold here need a pairwise scan
+            with np.errstate(invalid='ignore'):
+                best_ask = np.where(np.isnan(asks), np.inf, asks).min(axis=0)
+                best_bid = np.where(np.isnan(bids), -np.inf, bids).max(axis=0)
+                best_spread_percent = (best_bid - best_ask) / best_ask * 100
+            
+            # Only symbols whose quotes moved since the last cycle are rescanned;
+            # unchanged ones reuse the candidates cached for them
+            ask_volumes = book['ask_volume']
+            bid_volumes = book['bid_volume']
+            cells = np.stack((asks, bids, ask_volumes, bid_volumes))
+            layout = (symbols, exchanges, self.min_spread_percent)
+            changed = self._changed_symbols(cells, layout)
+            passing = best_spread_percent >= self.min_spread_percent
+            
+            symbol_candidates = self._symbol_candidates
+            for idx in np.flatnonzero(changed & ~passing):
+                symbol_candidates.pop(symbols[idx], None)
+            rescan = np.flatnonzero(changed & passing)
+            if rescan.size:
+                rescanned = {symbols[idx]: [] for idx in rescan}
+                for candidate in self._scan_quote_book(
+                    list(rescanned), exchanges, asks[:, rescan], bids[:, rescan],
+                    ask_volumes[:, rescan], bid_volumes[:, rescan]
+                ):
+                    rescanned[candidate[1]].append(candidate)
+                symbol_candidates.update(rescanned)
+            self._last_cells = cells
+            self._last_layout = layout
+            
+            candidates = [candidate for group in symbol_candidates.values() for candidate in group]
+            
+            # Rank on raw profit before paying for full opportunity scoring
+            if len(candidates) > self.max_opportunities:
+                candidates = heapq.nlargest(self.max_opportunities, candidates, key=itemgetter(0))
+            
+            opportunities = [self._build_opportunity(candidate, now) for candidate in candidates]
             
             opportunities.sort(key=lambda x: x.profit_potential, reverse=True)
             
-            self._update_historical_data(opportunities)
-            self.opportunities = {opp.id: opp for opp in opportunities}
+            self._update_historical_data(opportunities, now)
+            self.opportunities = {opp.route: opp for opp in opportunities}
+            by_symbol: Dict[str, List[ArbitrageOpportunity]] = {}
+            for opp in opportunities:
+                by_symbol.setdefault(opp.symbol, []).append(opp)
+            self.by_symbol = by_symbol
+            self._current_summary = self._summarize(opportunities)
             
             detection_time = time.time() - start_time
             self._update_detection_stats(detection_time, len(opportunities))
+            self.last_detection_failed = False
             
             if opportunities:
                 logger.info(f"🔍 Found {len(opportunities)} opportunities in {detection_time:.2f}s")
-                for opp in opportunities[:3]:
-                    logger.info(f"💰 {opp.symbol}: {opp.spread_percent:.3f}% "
-                              f"({opp.buy_exchange} → {opp.sell_exchange}) "
-                              f"Profit: ${opp.profit_potential:.2f}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for opp in opportunities[:3]:
+                        logger.debug(f"💰 {opp.symbol}: {opp.spread_percent:.3f}% "
+                                   f"({opp.buy_exchange} → {opp.sell_exchange}) "
+                                   f"Profit: ${opp.profit_potential:.2f}")
             else:
-                logger.debug(f"😴 No opportunities found in {detection_time:.2f}s")
+                logger.debug("😴 No opportunities found in %.2fs", detection_time)
             
         except Exception as e:
             logger.error(f"❌ Error in detect_opportunities: {e}")
         
         return opportunities
     
-    def _analyze_symbol(self, symbol: str, all_quotes: Dict) -> List[ArbitrageOpportunity]:
-        """Analyze arbitrage opportunities for a specific symbol"""
-        opportunities = []
-        
-        symbol_quotes = {}
-        for exchange_name, quotes in all_quotes.items():
-            if symbol in quotes:
-                symbol_quotes[exchange_name] = quotes[symbol]
-        
-        if len(symbol_quotes) < 2:
-            return opportunities
-        
-        exchanges = list(symbol_quotes.keys())
-        for i, buy_exchange in enumerate(exchanges):
-            for j, sell_exchange in enumerate(exchanges):
-                if i >= j:
-                    continue
-                
-                opportunities.extend(self._check_arbitrage_pair(
-                    symbol, buy_exchange, symbol_quotes[buy_exchange],
-                    sell_exchange, symbol_quotes[sell_exchange]
-                ))
-                opportunities.extend(self._check_arbitrage_pair(
-                    symbol, sell_exchange, symbol_quotes[sell_exchange],
-                    buy_exchange, symbol_quotes[buy_exchange]
-                ))
-        
-        return opportunities
+    def _changed_symbols(self, cells: np.ndarray, layout: Tuple) -> np.ndarray:
+        """Per-symbol mask of quote columns that differ from the previous cycle"""
+        previous = self._last_cells
+        if previous is None or previous.shape != cells.shape or layout != self._last_layout:
+            self._symbol_candidates.clear()
+            return np.ones(cells.shape[-1], dtype=bool)
+        
+        with np.errstate(invalid='ignore'):
+            differs = (cells != previous) & ~(np.isnan(cells) & np.isnan(previous))
+        return differs.any(axis=(0, 1))
     
-    def _check_arbitrage_pair(self, symbol: str, buy_exchange: str, buy_quote: Quote,
-                            sell_exchange: str, sell_quote: Quote) -> List[ArbitrageOpportunity]:
-        """Check for arbitrage between two exchanges"""
-        opportunities = []
-        
-        try:
-            buy_price = buy_quote.ask
-            sell_price = sell_quote.bid
+    def _scan_quote_book(self, symbols: List[str], exchanges: Sequence[str], asks: np.ndarray, bids: np.ndarray,
+                         ask_volumes: np.ndarray, bid_volumes: np.ndarray) -> List[Tuple]:
+        """Candidate (raw_profit, symbol, buy, sell, prices, spread, spread_percent, volumes) tuples"""
+        candidates = []
+        
+        # spread[i, j, s]: buy symbol s at exchange i's ask, sell at exchange j's bid (NaN never passes)
+        spread = bids[np.newaxis, :, :] - asks[:, np.newaxis, :]
+        same_exchange = np.arange(len(exchanges))
+        spread[same_exchange, same_exchange, :] = -np.inf
+        with np.errstate(invalid='ignore'):
+            # One reciprocal per ask, then the pairwise percentages are just multiplies
+            percent_per_ask = 100.0 / asks
+            spread_percent = spread * percent_per_ask[:, np.newaxis, :]
+            mask = (spread > 0) & (spread_percent >= self.min_spread_percent)
+        
+        max_volumes = [_VOLUME_LIMITS.get(symbol.partition('/')[0], 100.0) for symbol in symbols]
+        
+        for buy_idx, sell_idx, symbol_idx in np.argwhere(mask):
+            buy_volume = _none_if_nan(ask_volumes[buy_idx, symbol_idx])
+            sell_volume = _none_if_nan(bid_volumes[sell_idx, symbol_idx])
+            pair_spread = float(spread[buy_idx, sell_idx, symbol_idx])
             
-            if buy_price <= 0 or sell_price <= 0:
-                return opportunities
-            
-            spread = sell_price - buy_price
-            spread_percent = (spread / buy_price) * 100
-            
-            if spread > 0 and spread_percent >= self.min_spread_percent:
-                opportunity_id = f"{symbol}_{buy_exchange}_{sell_exchange}_{int(time.time())}"
-                
-                opportunity = ArbitrageOpportunity(
-                    id=opportunity_id,
-                    symbol=symbol,
-                    buy_exchange=buy_exchange,
-                    sell_exchange=sell_exchange,
-                    buy_price=buy_price,
-                    sell_price=sell_price,
-                    spread=spread,
-                    spread_percent=spread_percent,
-                    timestamp=time.time(),
-                    buy_volume=buy_quote.ask_volume,
-                    sell_volume=sell_quote.bid_volume
-                )
-                
-                opportunities.append(opportunity)
-        
-        except Exception as e:
-            logger.error(f"Error checking arbitrage pair: {e}")
-        
-        return opportunities
+            # Same ordering as ArbitrageOpportunity.profit_potential, without the scoring
+            raw_profit = 0.0
+            if buy_volume and sell_volume:
+                raw_profit = pair_spread * min(buy_volume, sell_volume, max_volumes[symbol_idx])
+            candidates.append((
+                raw_profit, symbols[symbol_idx], exchanges[buy_idx], exchanges[sell_idx],
+                float(asks[buy_idx, symbol_idx]), float(bids[sell_idx, symbol_idx]),
+                pair_spread, float(spread_percent[buy_idx, sell_idx, symbol_idx]),
+                buy_volume, sell_volume
+            ))
+        
+        return candidates
+    
+    @staticmethod
+    def _build_opportunity(candidate: Tuple, now: float) -> ArbitrageOpportunity:
+        """Materialize a ranked candidate tuple into a fully scored opportunity"""
+        (_, symbol, buy_exchange, sell_exchange, buy_price, sell_price,
+         spread, spread_percent, buy_volume, sell_volume) = candidate
+        
+        return ArbitrageOpportunity(
+            id=f"{symbol}:{buy_exchange}:{sell_exchange}",
+            symbol=symbol,
+            buy_exchange=buy_exchange,
+            sell_exchange=sell_exchange,
+            buy_price=buy_price,
+            sell_price=sell_price,
+            spread=spread,
+            spread_percent=spread_percent,
+            timestamp=now,
+            buy_volume=buy_volume,
+            sell_volume=sell_volume
+        )
     
-    def _update_historical_data(self, opportunities: List[ArbitrageOpportunity]):
+    def _update_historical_data(self, opportunities: List[ArbitrageOpportunity], now: float):
         """Update historical opportunity data"""
-        self.historical_opportunities.extend(opportunities)
-        
-        cutoff_time = time.time() - 86400  # 24 hours
-        self.historical_opportunities = [
-            opp for opp in self.historical_opportunities 
-            if opp.timestamp > cutoff_time
-        ]
+        history = self.historical_opportunities
+        counts = self._historical_counts
+        history_max = self._historical_max
         
         for opportunity in opportunities:
-            similar_count = sum(
-                1 for hist_opp in self.historical_opportunities
-                if (hist_opp.symbol == opportunity.symbol and
-                    hist_opp.buy_exchange == opportunity.buy_exchange and
-                    hist_opp.sell_exchange == opportunity.sell_exchange)
-            )
-            opportunity.historical_frequency = similar_count / max(1, len(self.historical_opportunities))
+            # A slim entry, so 24h of history doesn't pin every opportunity's cached serializations
+            entry = HistoryEntry(opportunity.route, opportunity.spread_percent, opportunity.timestamp)
+            history.append(entry)
+            counts[entry.route] += 1
+            self._historical_spread_sum += entry.spread_percent
+            while history_max and history_max[-1].spread_percent <= entry.spread_percent:
+                history_max.pop()
+            history_max.append(entry)
+        
+        self._evict_expired_history(now)
+        
+        total = max(1, len(history))
+        for opportunity in opportunities:
+            similar_count = counts[opportunity.route]
+            opportunity.historical_frequency = similar_count / total
+            opportunity.invalidate_cache()
+    
+    def _evict_expired_history(self, now: float):
+        """Pop entries older than 24h off the front of the history"""
+        history = self.historical_opportunities
+        counts = self._historical_counts
+        history_max = self._historical_max
+        cutoff_time = now - 86400  # 24 hours
+        
+        while history and history[0].timestamp <= cutoff_time:
+            expired = history.popleft()
+            key = expired.route
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+            self._historical_spread_sum -= expired.spread_percent
+            if history_max and history_max[0] is expired:
+                history_max.popleft()
+        
+        if not history:
+            # Start the running sum afresh rather than carry float drift forward
+            self._historical_spread_sum = 0.0
     
     def _update_detection_stats(self, detection_time: float, opportunities_count: int):
         """Update detection statistics"""
         self.detection_stats["total_detections"] += 1
         self.detection_stats["opportunities_found"] += opportunities_count
         
-        self.detection_stats["detection_times"].append(detection_time)
-        if len(self.detection_stats["detection_times"]) > 100:
-            self.detection_stats["detection_times"].pop(0)
+        times = self._detection_times
+        if len(times) == times.maxlen:
+            self._detection_time_sum -= times[0]
+        times.append(detection_time)
+        self._detection_time_sum += detection_time
         
-        self.detection_stats["avg_detection_time"] = statistics.mean(
-            self.detection_stats["detection_times"]
-        )
+        self.detection_stats["avg_detection_time"] = self._detection_time_sum / len(times)
     
     def add_alert_condition(self, condition: AlertCondition):
         """Add a new alert condition"""
         self.alert_conditions[condition.id] = condition
+        self._rebuild_alert_index()
         logger.info(f"Added alert condition: {condition.name}")
     
     def remove_alert_condition(self, condition_id: str):
         """Remove an alert condition"""
         if condition_id in self.alert_conditions:
             del self.alert_conditions[condition_id]
+            self._rebuild_alert_index()
             logger.info(f"Removed alert condition: {condition_id}")
     
     def check_alerts(self, opportunities: List[ArbitrageOpportunity]) -> List[Tuple[AlertCondition, ArbitrageOpportunity]]:
         """Check opportunities against alert conditions"""
         triggered_alerts = []
+        if not self._alert_index:
+            return triggered_alerts
         
         for opportunity in opportunities:
-            for condition in self.alert_conditions.values():
-                if condition.matches(opportunity):
-                    triggered_alerts.append((condition, opportunity))
+            for symbol_key in (opportunity.symbol, None):
+                indexed = self._alert_index.get(symbol_key)
+                if indexed is None:
+                    continue
+                
+                conditions, thresholds = indexed
+                # Only conditions whose spread threshold this opportunity reaches
+                reachable = bisect_right(thresholds, opportunity.spread_percent)
+                for condition in conditions[:reachable]:
+                    if condition.matches(opportunity):
+                        triggered_alerts.append((condition, opportunity))
         
         return triggered_alerts
     
+    def _rebuild_alert_index(self):
+        """Regroup alert conditions by symbol, ordered by spread threshold"""
+        index: Dict[Optional[str], Tuple[List[AlertCondition], List[float]]] = {}
+        for condition in sorted(self.alert_conditions.values(), key=lambda c: c.min_spread_percent):
+            conditions, thresholds = index.setdefault(condition.symbol or None, ([], []))
+            conditions.append(condition)
+            thresholds.append(condition.min_spread_percent)
+        self._alert_index = index
+    
     def get_analytics(self) -> Dict:
         """Get comprehensive analytics"""
-        current_time = time.time()
-        current_opps = list(self.opportunities.values())
-        recent_opps = [
-            opp for opp in self.historical_opportunities
-            if current_time - opp.timestamp < 86400
-        ]
+        # Once expired entries are popped, the history is exactly the last 24h
+        self._evict_expired_history(time.time())
+        
+        current = self._current_summary
+        historical_count = len(self.historical_opportunities)
         
         analytics = {
             "current": {
-                "total_opportunities": len(current_opps),
-                "avg_spread": statistics.mean([opp.spread_percent for opp in current_opps]) if current_opps else 0,
-                "max_spread": max([opp.spread_percent for opp in current_opps]) if current_opps else 0,
-                "total_profit_potential": sum([opp.profit_potential for opp in current_opps]),
-                "avg_confidence": statistics.mean([opp.confidence_score for opp in current_opps]) if current_opps else 0,
+                "total_opportunities": current["count"],
+                "avg_spread": current["avg_spread"],
+                "max_spread": current["max_spread"],
+                "total_profit_potential": current["total_profit"],
+                "avg_confidence": current["avg_confidence"],
             },
             "historical_24h": {
-                "total_opportunities": len(recent_opps),
-                "avg_spread": statistics.mean([opp.spread_percent for opp in recent_opps]) if recent_opps else 0,
-                "max_spread": max([opp.spread_percent for opp in recent_opps]) if recent_opps else 0,
-                "opportunities_per_hour": len(recent_opps) / 24,
+                "total_opportunities": historical_count,
+                "avg_spread": self._historical_spread_sum / historical_count if historical_count else 0,
+                "max_spread": self._historical_max[0].spread_percent if historical_count else 0,
+                "opportunities_per_hour": historical_count / 24,
             },
-            "detection_stats": self.detection_stats,
+            "detection_stats": {**self.detection_stats, "detection_times": list(self._detection_times)},
             "alert_conditions": len(self.alert_conditions)
         }
         
         return analytics
 
+    @staticmethod
+    def _summarize(opportunities: Iterable[ArbitrageOpportunity]) -> Dict:
+        """Spread, profit and confidence aggregates gathered in a single pass"""
+        count = 0
+        sum_spread = max_spread = sum_profit = sum_confidence = 0.0
+        
+        for opp in opportunities:
+            spread_percent = opp.spread_percent
+            count += 1
+            sum_spread += spread_percent
+            if count == 1 or spread_percent > max_spread:
+                max_spread = spread_percent
+            sum_profit += opp.profit_potential
+            sum_confidence += opp.confidence_score
+        
+        if not count:
+            return {"count": 0, "avg_spread": 0, "max_spread": 0, "total_profit": 0, "avg_confidence": 0}
+        
+        return {
+            "count": count,
+            "avg_spread": sum_spread / count,
+            "max_spread": max_spread,
+            "total_profit": sum_profit,
+            "avg_confidence": sum_confidence / count
+        }
+
 # Global detector instance
 arbitrage_detector = ArbitrageDetector(min_spread_percent=0.05)
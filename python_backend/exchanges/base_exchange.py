@@ -1,13 +1,21 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
+from collections import deque
+from pathlib import Path
+import os
+import tempfile
 import time
 import asyncio
 import logging
+import random
+import aiohttp
+import ccxt.async_support as ccxt
+import orjson
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     """Normalized quote format across all exchanges"""
     exchange: str
@@ -22,6 +30,7 @@ class Quote:
     daily_change_percent: Optional[float] = None
     
     def to_dict(self) -> Dict[str, Any]:
+        spread = self.ask - self.bid
         return {
             "exchange": self.exchange,
             "symbol": self.symbol,
@@ -33,11 +42,11 @@ class Quote:
             "last_price": self.last_price,
             "daily_change": self.daily_change,
             "daily_change_percent": self.daily_change_percent,
-            "spread": self.ask - self.bid,
-            "spread_percent": ((self.ask - self.bid) / self.bid) * 100 if self.bid > 0 else 0
+            "spread": spread,
+            "spread_percent": (spread / self.bid) * 100 if self.bid > 0 else 0
         }
 
-@dataclass
+@dataclass(slots=True)
 class ExchangeStatus:
     """Exchange connection and health status"""
     name: str
@@ -79,6 +88,11 @@ class ExchangeStatus:
 class BaseExchange(ABC):
     """Abstract base class for all exchange implementations"""
     
+    # Market metadata is cached on disk between runs and reused while younger than this;
+    # the directory is private to the user, since the file maps symbols to market ids
+    markets_cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'crypto_arbitrage'
+    markets_cache_ttl = 86400
+    
     def __init__(self, name: str, symbols: List[str]):
         self.name = name
         self.symbols = symbols
@@ -90,8 +104,72 @@ class BaseExchange(ABC):
             avg_response_time=0,
             supported_symbols=symbols
         )
-        self.response_times = []
         self.max_response_times = 10
+        # Last max_response_times samples and their running sum, for the rolling average
+        self.response_times: Deque[float] = deque(maxlen=self.max_response_times)
+        self._response_time_sum = 0.0
+        self.exchange = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Attempts for one batched ticker request before the round is given up
+        self.max_retries = 1
+        # First backoff before a retry; doubles per attempt, plus up to 50% jitter
+        self.retry_delay = 0.1
+        # Caps in-flight per-symbol requests when an exchange has no batch endpoint
+        self.max_concurrent_requests = 4
+        self._request_slots = asyncio.Semaphore(self.max_concurrent_requests)
+        # AIMD pause on top of ccxt's fixed pacing: doubles whenever the exchange throttles us,
+        # shrinks by a step after each successful request
+        self.throttle_backoff = 0.0
+        self.throttle_step = 1.0
+        self.max_throttle_backoff = 60.0
+        self._throttled_until = 0.0
+        self._exchange_symbols: Optional[Dict[str, str]] = None
+    
+    def client_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """ccxt client options, sharing the manager's pooled HTTP session when one is set"""
+        if self.session is not None:
+            config = {**config, 'session': self.session}
+        return config
+    
+    async def load_markets(self):
+        """Load ccxt market metadata, from the on-disk cache when it is fresh enough"""
+        # Keyed by ccxt version too, since market structures change between releases
+        path = self.markets_cache_dir / f"{self.name}_markets_{ccxt.__version__}.json"
+        try:
+            if time.time() - path.stat().st_mtime < self.markets_cache_ttl:
+                cached = orjson.loads(path.read_bytes())
+                self.exchange.set_markets(cached['markets'], cached['currencies'])
+                logger.info(f"📦 {self.name} markets loaded from {path}")
+                return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable {self.name} markets cache: {e}")
+        
+        await self.with_retries(self.exchange.load_markets)
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Write beside the target and rename over it, so concurrent workers never
+            # read a half-written file
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    tmp.write(orjson.dumps({
+                        'markets': self.exchange.markets,
+                        'currencies': self.exchange.currencies or None
+                    }))
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except Exception as e:
+            # Caching is best effort; the markets themselves loaded fine
+            logger.warning(f"⚠️ Could not cache {self.name} markets: {e}")
+    
+    async def close(self):
+        """Release the ccxt client (a shared session is left open for its owner)"""
+        if self.exchange is not None:
+            await self.exchange.close()
     
     @abstractmethod
     async def connect(self) -> bool:
@@ -108,13 +186,57 @@ class BaseExchange(ABC):
         """Convert standard symbol format to exchange-specific format"""
         pass
     
+    @property
+    def exchange_symbols(self) -> Dict[str, str]:
+        """Standard symbol keyed by exchange-specific symbol, normalized once per client"""
+        if self._exchange_symbols is None:
+            self._exchange_symbols = {self.normalize_symbol(symbol): symbol for symbol in self.symbols}
+        return self._exchange_symbols
+    
+    def quote_from_ticker(self, symbol: str, ticker: Optional[Dict[str, Any]],
+                          received_at: Optional[float] = None) -> Optional[Quote]:
+        """Normalize a ccxt ticker into a Quote, or None if it has no usable bid/ask"""
+        if not ticker:
+            return None
+        
+        # Read each field once; a missing, zero or crossed bid/ask is unusable
+        bid = ticker.get('bid')
+        ask = ticker.get('ask')
+        if not (bid and ask and bid < ask):
+            return None
+        
+        return Quote(
+            exchange=self.name,
+            symbol=symbol,
+            bid=float(bid),
+            ask=float(ask),
+            timestamp=time.time() if received_at is None else received_at,
+            bid_volume=ticker.get('bidVolume'),
+            ask_volume=ticker.get('askVolume'),
+            last_price=ticker.get('last'),
+            daily_change=ticker.get('change'),
+            daily_change_percent=ticker.get('percentage')
+        )
+    
+    @property
+    def throttled(self) -> bool:
+        """Whether a rate-limit pause is in effect for this exchange"""
+        return time.time() < self._throttled_until
+    
     async def fetch_all_tickers(self) -> Dict[str, Quote]:
-        """Fetch all supported tickers"""
+        """Fetch all supported tickers, in one batched request where the exchange allows it"""
+        if self.throttled:
+            logger.debug("🚦 %s is backing off for rate limits, skipping this round", self.name)
+            return {}
+        
+        if self.exchange is not None and self.exchange.has.get('fetchTickers'):
+            return await self._fetch_tickers_batch()
+        
         results = {}
         tasks = []
         
         for symbol in self.symbols:
-            task = self.fetch_ticker(symbol)
+            task = self._fetch_ticker_bounded(symbol)
             tasks.append((symbol, task))
         
         try:
@@ -127,7 +249,8 @@ class BaseExchange(ABC):
                 elif response is not None:
                     results[symbol] = response
             
-            self.status.last_update = time.time()
+            if results:
+                self.status.last_update = time.time()
             
         except Exception as e:
             logger.error(f"Error fetching all tickers from {self.name}: {e}")
@@ -135,16 +258,87 @@ class BaseExchange(ABC):
         
         return results
     
+    async def _fetch_ticker_bounded(self, symbol: str) -> Optional[Quote]:
+        """fetch_ticker while holding one of this exchange's request slots"""
+        async with self._request_slots:
+            return await self.fetch_ticker(symbol)
+    
+    async def _fetch_tickers_batch(self) -> Dict[str, Quote]:
+        """One fetch_tickers round trip for every supported symbol"""
+        results = {}
+        if not self.status.connected:
+            return results
+        
+        exchange_symbols = self.exchange_symbols
+        
+        try:
+            start_time = time.time()
+            tickers = await self.with_retries(self.exchange.fetch_tickers, list(exchange_symbols))
+            # Every quote in the batch arrived in the same response, so they share its timestamp
+            received_at = time.time()
+            self.update_response_time(received_at - start_time)
+            
+            for exchange_symbol, symbol in exchange_symbols.items():
+                ticker = tickers.get(exchange_symbol) or tickers.get(symbol)
+                quote = self.quote_from_ticker(symbol, ticker, received_at)
+                if quote is not None:
+                    results[symbol] = quote
+            
+            # An empty or unmatched batch isn't a sign of life; leave it to the health checks
+            if results:
+                self.status.last_update = received_at
+            
+        except Exception as e:
+            logger.error(f"Error fetching all tickers from {self.name}: {e}")
+            self.status.error_count += 1
+        
+        return results
+    
+    async def with_retries(self, call, *args):
+        """Await call(*args), retrying transient network failures with jittered exponential backoff"""
+        # Every ccxt request goes through here, so none of them can ignore a rate-limit pause
+        if self.throttled:
+            raise ccxt.RateLimitExceeded(f"{self.name} is backing off for rate limits")
+        
+        delay = self.retry_delay
+        for attempt in range(self.max_retries):
+            try:
+                result = await call(*args)
+                self.throttle_backoff = max(0.0, self.throttle_backoff - self.throttle_step)
+                return result
+            except ccxt.DDoSProtection:
+                # Rate limited: retrying now only digs deeper, so back off instead
+                self._record_throttle()
+                raise
+            except (ccxt.NetworkError, asyncio.TimeoutError):
+                # Exchange errors (bad symbol, auth, ...) won't resolve by retrying, so only these do
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(delay + random.random() * delay * 0.5)
+                delay *= 2
+    
+    def _record_throttle(self):
+        """Double the rate-limit pause and stop polling this exchange until it has passed"""
+        self.throttle_backoff = min(self.max_throttle_backoff, max(self.throttle_step, self.throttle_backoff * 2))
+        self._throttled_until = time.time() + self.throttle_backoff
+        logger.warning(f"🚦 {self.name} is rate limiting us, pausing for {self.throttle_backoff:.0f}s")
+    
     def update_response_time(self, response_time: float):
         """Update average response time tracking"""
-        self.response_times.append(response_time)
-        if len(self.response_times) > self.max_response_times:
-            self.response_times.pop(0)
+        times = self.response_times
+        if len(times) == times.maxlen:
+            self._response_time_sum -= times[0]
+        times.append(response_time)
+        self._response_time_sum += response_time
         
-        self.status.avg_response_time = sum(self.response_times) / len(self.response_times)
+        self.status.avg_response_time = self._response_time_sum / len(times)
     
     async def health_check(self) -> bool:
         """Perform health check on the exchange"""
+        if self.throttled:
+            # Being rate limited shows the exchange is up; probing now would only prolong it
+            return self.status.connected
+        
         try:
             start_time = time.time()
             test_symbol = self.symbols[0] if self.symbols else "BTC/USD"
@@ -1,5 +1,4 @@
-import ccxt
-import asyncio
+import ccxt.async_support as ccxt
 import time
 import logging
 from typing import Optional
@@ -7,34 +6,34 @@ from .base_exchange import BaseExchange, Quote
 
 logger = logging.getLogger(__name__)
 
+# Standard symbol -> exchange symbol, shared by every instance
+_SYMBOL_MAPPING = {
+    'BTC/USD': 'tBTCUSD',
+    'ETH/USD': 'tETHUSD',
+    'XRP/USD': 'tXRPUSD',
+    'LTC/USD': 'tLTCUSD',
+    'ADA/USD': 'tADAUSD',
+    'DOT/USD': 'tDOTUSD',
+    'LINK/USD': 'tLINKUSD',
+    'UNI/USD': 'tUNIUSD'
+}
+
 class BitfinexExchange(BaseExchange):
     """Bitfinex exchange implementation"""
     
     def __init__(self, symbols):
         super().__init__("bitfinex", symbols)
         self.exchange = None
-        self.symbol_mapping = {
-            'BTC/USD': 'tBTCUSD',
-            'ETH/USD': 'tETHUSD',
-            'XRP/USD': 'tXRPUSD',
-            'LTC/USD': 'tLTCUSD',
-            'ADA/USD': 'tADAUSD',
-            'DOT/USD': 'tDOTUSD',
-            'LINK/USD': 'tLINKUSD',
-            'UNI/USD': 'tUNIUSD'
-        }
     
     async def connect(self) -> bool:
         try:
-            self.exchange = ccxt.bitfinex({
+            self.exchange = ccxt.bitfinex(self.client_config({
                 'enableRateLimit': True,
                 'timeout': 15000,
                 'rateLimit': 1500,
-            })
+            }))
             
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.load_markets
-            )
+            await self.load_markets()
             
             self.status.connected = True
             logger.info(f"✅ {self.name} connected successfully")
@@ -47,7 +46,7 @@ class BitfinexExchange(BaseExchange):
             return False
     
     def normalize_symbol(self, symbol: str) -> str:
-        return self.symbol_mapping.get(symbol, symbol)
+        return _SYMBOL_MAPPING.get(symbol, symbol)
     
     async def fetch_ticker(self, symbol: str) -> Optional[Quote]:
         if not self.exchange or not self.status.connected:
@@ -57,31 +56,13 @@ class BitfinexExchange(BaseExchange):
             start_time = time.time()
             bitfinex_symbol = self.normalize_symbol(symbol)
             
-            ticker = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_ticker, bitfinex_symbol
-            )
-            
-            response_time = time.time() - start_time
-            self.update_response_time(response_time)
-            
-            if not ticker or not ticker.get('bid') or not ticker.get('ask'):
-                return None
+            ticker = await self.with_retries(self.exchange.fetch_ticker, bitfinex_symbol)
             
-            if ticker['bid'] >= ticker['ask']:
-                return None
+            # One clock read serves as both the response time and the quote's timestamp
+            received_at = time.time()
+            self.update_response_time(received_at - start_time)
             
-            return Quote(
-                exchange=self.name,
-                symbol=symbol,
-                bid=float(ticker['bid']),
-                ask=float(ticker['ask']),
-                timestamp=time.time(),
-                bid_volume=ticker.get('bidVolume'),
-                ask_volume=ticker.get('askVolume'),
-                last_price=ticker.get('last'),
-                daily_change=ticker.get('change'),
-                daily_change_percent=ticker.get('percentage')
-            )
+            return self.quote_from_ticker(symbol, ticker, received_at)
             
         except Exception as e:
             logger.error(f"❌ Error fetching {symbol} from {self.name}: {e}")
@@ -1,7 +1,9 @@
 import asyncio
 import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import aiohttp
+import numpy as np
 from .base_exchange import BaseExchange, Quote, ExchangeStatus
 from .kraken_exchange import KrakenExchange
 from .kucoin_exchange import KuCoinExchange
@@ -9,14 +11,23 @@ from .bitfinex_exchange import BitfinexExchange
 
 logger = logging.getLogger(__name__)
 
+# Fields of the quote matrix, each kept as its own contiguous (exchange x symbol)
+# float64 array so scans read one field without striding over the others; NaN marks a missing value
+QUOTE_FIELDS = ('bid', 'ask', 'bid_volume', 'ask_volume', 'timestamp')
+
+def _float_or_nan(value: Optional[float]) -> float:
+    """Optional quote field as a float matrix cell"""
+    return float('nan') if value is None else value
+
 class ExchangeManager:
     """Enhanced exchange manager with health monitoring"""
     
     def __init__(self):
-        self.symbols = [
+        # Immutable, so it can be handed out without copying
+        self.symbols: Tuple[str, ...] = (
             'BTC/USDT', 'ETH/USDT', 'XRP/USDT', 'LTC/USDT', 
             'ADA/USDT', 'DOT/USDT', 'LINK/USDT'
-        ]
+        )
 
         
         self.exchanges: Dict[str, BaseExchange] = {
@@ -24,17 +35,31 @@ class ExchangeManager:
             'kucoin': KuCoinExchange(self.symbols),
             'bitfinex': BitfinexExchange(self.symbols)
         }
+        # Row and column order of quote_matrix
+        self.exchange_names: Tuple[str, ...] = tuple(self.exchanges)
+        self._symbol_index = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self.quote_matrix: Dict[str, np.ndarray] = self._build_quote_matrix({})
         
         self.quotes_cache: Dict[str, Dict[str, Quote]] = {}
+        # quotes_cache as plain dicts, built on first request after each fetch round
+        self._quote_dicts: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
         self.last_update = 0
+        # Cached quotes younger than this are served without a fresh fetch
+        self.quote_max_age = 30
+        # Past this age a cached quote is still served, but refreshed in the background
+        self.quote_soft_ttl = 5
+        self._quote_refreshes: Dict[Tuple[str, str], asyncio.Task] = {}
         self.health_check_interval = 60
+        # Per-exchange budget for one round of tickers; a slower exchange is skipped that cycle
+        self.fetch_timeout = 5.0
         self.last_health_check = 0
     
-    async def initialize(self) -> Dict[str, bool]:
-        """Initialize all exchanges"""
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, bool]:
+        """Initialize all exchanges, optionally sharing one pooled HTTP session"""
         results = {}
         
         for name, exchange in self.exchanges.items():
+            exchange.session = session
             try:
                 success = await exchange.connect()
                 results[name] = success
@@ -45,17 +70,23 @@ class ExchangeManager:
         
         return results
     
-    async def fetch_all_quotes(self) -> Dict[str, Dict[str, Quote]]:
-        """Fetch quotes from all connected exchanges"""
+    async def close(self):
+        """Close all exchange clients"""
+        for name, exchange in self.exchanges.items():
+            try:
+                await exchange.close()
+            except Exception as e:
+                logger.error(f"Error closing {name}: {e}")
+    
+    async def fetch_all_quotes(self, timeout: Optional[float] = None) -> Dict[str, Dict[str, Quote]]:
+        """Fetch quotes from all connected exchanges concurrently, each bounded by timeout"""
         all_quotes = {}
-        
-        if time.time() - self.last_health_check > self.health_check_interval:
-            await self.perform_health_checks()
+        timeout = self.fetch_timeout if timeout is None else timeout
         
         tasks = []
         for name, exchange in self.exchanges.items():
             if exchange.status.connected:
-                task = exchange.fetch_all_tickers()
+                task = asyncio.wait_for(exchange.fetch_all_tickers(), timeout)
                 tasks.append((name, task))
         
         if not tasks:
@@ -66,31 +97,129 @@ class ExchangeManager:
             results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
             
             for (name, _), result in zip(tasks, results):
-                if isinstance(result, Exception):
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(f"⏱️ {name} quotes timed out after {timeout:.1f}s, skipping this cycle")
+                    self.exchanges[name].status.error_count += 1
+                elif isinstance(result, Exception):
                     logger.error(f"Error fetching from {name}: {result}")
                     self.exchanges[name].status.error_count += 1
                 elif result:
                     all_quotes[name] = result
             
             self.quotes_cache = all_quotes
+            self._quote_dicts = None
+            self.quote_matrix = self._build_quote_matrix(all_quotes)
             self.last_update = time.time()
             
-            logger.info(f"✅ Fetched quotes from {len(all_quotes)} exchanges")
+            logger.debug("✅ Fetched quotes from %d exchanges", len(all_quotes))
             
         except Exception as e:
             logger.error(f"Error in fetch_all_quotes: {e}")
         
         return all_quotes
     
-    async def perform_health_checks(self):
-        """Perform health checks on all exchanges"""
-        logger.info("🔍 Performing health checks...")
+    def _build_quote_matrix(self, all_quotes: Dict[str, Dict[str, Quote]]) -> Dict[str, np.ndarray]:
+        """Pack a round of quotes into per-field (exchange x symbol) arrays"""
+        shape = (len(self.exchange_names), len(self.symbols))
+        matrix = {name: np.full(shape, np.nan) for name in QUOTE_FIELDS}
+        bids, asks = matrix['bid'], matrix['ask']
+        bid_volumes, ask_volumes = matrix['bid_volume'], matrix['ask_volume']
+        timestamps = matrix['timestamp']
+        
+        for exchange_idx, name in enumerate(self.exchange_names):
+            for symbol, quote in all_quotes.get(name, {}).items():
+                symbol_idx = self._symbol_index.get(symbol)
+                if symbol_idx is None:
+                    continue
+                cell = (exchange_idx, symbol_idx)
+                bids[cell] = quote.bid
+                asks[cell] = quote.ask
+                bid_volumes[cell] = _float_or_nan(quote.bid_volume)
+                ask_volumes[cell] = _float_or_nan(quote.ask_volume)
+                timestamps[cell] = quote.timestamp
+        
+        return matrix
+    
+    def get_quote_dicts(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Serialized quotes_cache, shared by every caller until the next fetch round"""
+        if self._quote_dicts is None:
+            self._quote_dicts = {
+                exchange: {symbol: quote.to_dict() for symbol, quote in quotes.items()}
+                for exchange, quotes in self.quotes_cache.items()
+            }
+        return self._quote_dicts
+    
+    def quotes_are_fresh(self) -> bool:
+        """Whether quotes_cache is recent enough to serve without fetching"""
+        return time.time() - self.last_update < self.quote_max_age
+    
+    def get_market_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-symbol price statistics across exchanges, computed column-wise over quote_matrix"""
+        matrix = self.quote_matrix
+        with np.errstate(invalid='ignore'):
+            valid = (matrix['bid'] > 0) & (matrix['ask'] > 0)
+        counts = valid.sum(axis=0)
+        # Only symbols quoted somewhere, so no statistic is taken over an all-NaN column
+        quoted = np.flatnonzero(counts)
+        if not quoted.size:
+            return {}
+        
+        bids = np.where(valid, matrix['bid'], np.nan)[:, quoted]
+        asks = np.where(valid, matrix['ask'], np.nan)[:, quoted]
+        mids = (bids + asks) * 0.5
+        
+        min_mid = np.nanmin(mids, axis=0)
+        max_mid = np.nanmax(mids, axis=0)
+        best_bid_idx = np.nanargmax(bids, axis=0)
+        best_ask_idx = np.nanargmin(asks, axis=0)
+        columns = np.arange(quoted.size)
         
+        stats = zip(
+            quoted.tolist(), counts[quoted].tolist(),
+            min_mid.tolist(), max_mid.tolist(), np.nanmean(mids, axis=0).tolist(), np.nanstd(mids, axis=0).tolist(),
+            ((max_mid - min_mid) / min_mid * 100).tolist(), np.nanmean(asks - bids, axis=0).tolist(),
+            bids[best_bid_idx, columns].tolist(), best_bid_idx.tolist(),
+            asks[best_ask_idx, columns].tolist(), best_ask_idx.tolist()
+        )
+        
+        summary = {}
+        for (symbol_idx, count, min_price, max_price, avg_price, price_std, range_percent, avg_spread,
+             best_bid, best_bid_exchange, best_ask, best_ask_exchange) in stats:
+            summary[self.symbols[symbol_idx]] = {
+                "exchanges": count,
+                "min_price": min_price,
+                "max_price": max_price,
+                "avg_price": avg_price,
+                "price_std": price_std,
+                "price_range_percent": range_percent,
+                "avg_spread": avg_spread,
+                "best_bid": best_bid,
+                "best_bid_exchange": self.exchange_names[best_bid_exchange],
+                "best_ask": best_ask,
+                "best_ask_exchange": self.exchange_names[best_ask_exchange]
+            }
+        
+        return summary
+    
+    def get_quote_matrix(self) -> Dict[str, np.ndarray]:
+        """Latest quotes as QUOTE_FIELDS arrays, rows in exchange_names order, columns in symbols order"""
+        return self.quote_matrix
+    
+    async def perform_health_checks(self):
+        """Probe exchanges that haven't delivered quotes within the last health_check_interval"""
+        # A recent successful quote round already proves an exchange is healthy
+        # and has updated its response time, so only the rest get a probe request
+        stale_before = time.time() - self.health_check_interval
         tasks = []
         for name, exchange in self.exchanges.items():
+            if exchange.status.connected and exchange.status.last_update > stale_before:
+                continue
             task = exchange.health_check()
             tasks.append((name, task))
         
+        if tasks:
+            logger.info(f"🔍 Performing health checks on {', '.join(name for name, _ in tasks)}...")
+        
         results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
         
         for (name, _), result in zip(tasks, results):
@@ -111,9 +240,9 @@ class ExchangeManager:
             for name, exchange in self.exchanges.items()
         }
     
-    def get_supported_symbols(self) -> List[str]:
-        """Get list of supported symbols"""
-        return self.symbols.copy()
+    def get_supported_symbols(self) -> Tuple[str, ...]:
+        """Get the supported symbols"""
+        return self.symbols
     
     def get_connected_exchanges(self) -> List[str]:
         """Get list of currently connected exchanges"""
@@ -123,16 +252,43 @@ class ExchangeManager:
         ]
     
     async def get_quote(self, exchange: str, symbol: str) -> Optional[Quote]:
-        """Get a specific quote from cache or fetch fresh"""
-        if (exchange in self.quotes_cache and 
-            symbol in self.quotes_cache[exchange] and
-            time.time() - self.last_update < 30):
-            return self.quotes_cache[exchange][symbol]
+        """Get a specific quote from cache (stale-while-revalidate) or fetch fresh"""
+        # A rate-limited exchange is served from cache only, without refreshes
+        client = self.exchanges.get(exchange)
+        connected = client is not None and client.status.connected and not client.throttled
+        quote = self.quotes_cache.get(exchange, {}).get(symbol)
         
-        if exchange in self.exchanges and self.exchanges[exchange].status.connected:
-            return await self.exchanges[exchange].fetch_ticker(symbol)
+        if quote is not None:
+            age = time.time() - quote.timestamp
+            if age < self.quote_max_age:
+                if age >= self.quote_soft_ttl and connected:
+                    self._refresh_quote(exchange, symbol)
+                return quote
+        
+        if connected:
+            # Concurrent misses for the same quote all wait on one fetch; shielded so a
+            # cancelled caller doesn't cancel it for the others
+            return await asyncio.shield(self._refresh_quote(exchange, symbol))
         
         return None
+    
+    def _refresh_quote(self, exchange: str, symbol: str) -> asyncio.Task:
+        """Fetch one quote in a task shared by every caller until it finishes (single-flight)"""
+        key = (exchange, symbol)
+        task = self._quote_refreshes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_cache_quote(exchange, symbol))
+            self._quote_refreshes[key] = task
+            task.add_done_callback(lambda _: self._quote_refreshes.pop(key, None))
+        return task
+    
+    async def _fetch_and_cache_quote(self, exchange: str, symbol: str) -> Optional[Quote]:
+        """Fetch one quote and write it back into quotes_cache"""
+        quote = await self.exchanges[exchange].fetch_ticker(symbol)
+        if quote is not None:
+            self.quotes_cache.setdefault(exchange, {})[symbol] = quote
+            self._quote_dicts = None
+        return quote
 
 # Global instance
 exchange_manager = ExchangeManager()
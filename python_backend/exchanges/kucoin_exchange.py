@@ -1,5 +1,4 @@
-import ccxt
-import asyncio
+import ccxt.async_support as ccxt
 import time
 import logging
 from typing import Optional
@@ -16,15 +15,13 @@ class KuCoinExchange(BaseExchange):
     
     async def connect(self) -> bool:
         try:
-            self.exchange = ccxt.kucoin({
+            self.exchange = ccxt.kucoin(self.client_config({
                 'enableRateLimit': True,
                 'timeout': 15000,
                 'rateLimit': 1000,
-            })
+            }))
             
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.load_markets
-            )
+            await self.load_markets()
             
             self.status.connected = True
             logger.info(f"✅ {self.name} connected successfully")
@@ -46,31 +43,13 @@ class KuCoinExchange(BaseExchange):
         try:
             start_time = time.time()
             
-            ticker = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_ticker, symbol
-            )
+            ticker = await self.with_retries(self.exchange.fetch_ticker, symbol)
             
-            response_time = time.time() - start_time
-            self.update_response_time(response_time)
+            # One clock read serves as both the response time and the quote's timestamp
+            received_at = time.time()
+            self.update_response_time(received_at - start_time)
             
-            if not ticker or not ticker.get('bid') or not ticker.get('ask'):
-                return None
-            
-            if ticker['bid'] >= ticker['ask']:
-                return None
-            
-            return Quote(
-                exchange=self.name,
-                symbol=symbol,
-                bid=float(ticker['bid']),
-                ask=float(ticker['ask']),
-                timestamp=time.time(),
-                bid_volume=ticker.get('bidVolume'),
-                ask_volume=ticker.get('askVolume'),
-                last_price=ticker.get('last'),
-                daily_change=ticker.get('change'),
-                daily_change_percent=ticker.get('percentage')
-            )
+            return self.quote_from_ticker(symbol, ticker, received_at)
             
         except Exception as e:
             logger.error(f"❌ Error fetching {symbol} from {self.name}: {e}")
@@ -2,16 +2,17 @@
 """
 Test script for the focused 3-exchange arbitrage system
 """
+import argparse
 import asyncio
 import json
 import time
-from exchanges import exchange_manager
+from exchanges.exchange_manager import exchange_manager
 from arbitrage.detector import arbitrage_detector
 
 async def test_exchange_connections():
     """Test connections to our three focused exchanges"""
     print("🔌 Testing connections to our three focused exchanges...")
-    results = await exchange_manager.test_connections()
+    results = await exchange_manager.initialize()
     
     exchange_info = {
         'kraken': '🇺🇸 Kraken - US-based, highly reliable',
@@ -79,8 +80,8 @@ async def test_arbitrage_detection():
         print(f"   📈 Buy:  {opp.buy_exchange:<10} @ ${opp.buy_price:>8.4f}")
         print(f"   📉 Sell: {opp.sell_exchange:<10} @ ${opp.sell_price:>8.4f}")
         print(f"   💰 Spread: ${opp.spread:>6.4f} ({opp.spread_percent:>5.3f}%)")
-        print(f"   🎯 Confidence: {opp.calculate_confidence():>4.2f}")
-        print(f"   💵 Profit Potential: ${opp.calculate_profit_potential():>6.2f}")
+        print(f"   🎯 Confidence: {opp.confidence_score:>4.2f}")
+        print(f"   💵 Profit Potential: ${opp.profit_potential:>6.2f}")
         
         if opp.buy_volume and opp.sell_volume:
             min_vol = min(opp.buy_volume, opp.sell_volume)
@@ -114,7 +115,7 @@ async def continuous_monitoring(duration: int = 120):
                 print(f"🎯 Found {len(opportunities)} opportunities in {detection_time:.2f}s")
                 print(f"🏆 Best: {best_opp.symbol} - {best_opp.spread_percent:.3f}% spread")
                 print(f"   {best_opp.buy_exchange} → {best_opp.sell_exchange}")
-                print(f"   Profit potential: ${best_opp.calculate_profit_potential():.2f}")
+                print(f"   Profit potential: ${best_opp.profit_potential:.2f}")
             else:
                 print(f"😴 No opportunities found in {detection_time:.2f}s")
         
@@ -130,7 +131,7 @@ async def continuous_monitoring(duration: int = 120):
     print(f"   Best spread seen: {best_spread_seen:.3f}%")
     print(f"   Average opportunities per check: {total_opportunities/iteration:.1f}")
 
-async def main():
+async def main(monitor: bool = False, duration: int = 120):
     """Main test function"""
     print("🚀 Testing Focused 3-Exchange Arbitrage System\n")
     print("🎯 Exchanges: Kraken, KuCoin, Bitfinex")
@@ -155,10 +156,9 @@ async def main():
         # Test 3: Arbitrage detection
         await test_arbitrage_detection()
         
-        # Test 4: Ask user if they want continuous monitoring
-        response = input("\n🤔 Run continuous monitoring for 2 minutes? (y/n): ")
-        if response.lower() in ['y', 'yes']:
-            await continuous_monitoring(120)
+        # Test 4: Continuous monitoring, only when requested with --monitor
+        if monitor:
+            await continuous_monitoring(duration)
         
         print("\n🎉 All tests completed successfully!")
         print("\n💡 Tips for better arbitrage detection:")
@@ -172,6 +172,12 @@ async def main():
     except Exception as e:
         print(f"\n❌ Test failed with error: {e}")
         raise
+    finally:
+        await exchange_manager.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Test the focused 3-exchange arbitrage system")
+    parser.add_argument("--monitor", action="store_true", help="run continuous monitoring after the tests")
+    parser.add_argument("--duration", type=int, default=120, help="monitoring duration in seconds (default: 120)")
+    args = parser.parse_args()
+    asyncio.run(main(args.monitor, args.duration))
@@ -45,6 +45,8 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Test failed: {e}")
         raise
+    finally:
+        await exchange_manager.close()
 
 if __name__ == "__main__":
     asyncio.run(main())